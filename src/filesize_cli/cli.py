@@ -20,13 +20,29 @@ and directories with support for multiple units, recursive traversal, and
 various output formats.
 """
 
-import argparse
+import os
+import stat
 import sys
-from pathlib import Path
-from typing import List, Optional, Union, cast
+from pathlib import PurePath
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 from . import __version__
 
+if TYPE_CHECKING:
+    import argparse
+    import threading
+
 # Constants for binary units (base 1024)
 KB = 1024
 MB = KB**2
@@ -42,6 +58,26 @@ UNIT_MAP = {
     "tb": (TB, "TB"),
 }
 
+# (factor, suffix) pairs ordered so that index i holds the factor 1024**i
+_UNITS_ASC = tuple(sorted(UNIT_MAP.values()))
+_MAX_UNIT_INDEX = len(_UNITS_ASC) - 1
+
+# Anything accepted as a single path by get_size
+PathArg = Union[str, bytes, "os.PathLike[str]", "os.PathLike[bytes]"]
+
+# os.fwalk hands out directory descriptors, letting files be stat'ed
+# relative to their directory instead of re-resolving the full path
+_HAS_FWALK = hasattr(os, "fwalk") and os.stat in os.supports_dir_fd
+
+# Errors that skip a single file during a scan: it vanished after being
+# listed, or it cannot be read. Anything else aborts the scan.
+_SKIPPED_FILE_ERRORS = (FileNotFoundError, PermissionError)
+
+# Recursive scans with more top-level subdirectories than this are
+# spread across a thread pool, one subtree per task
+PARALLEL_MIN_DIRS = 4
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 
 class FilesizeCLI:
     """Command-line interface for file and directory size calculations."""
@@ -49,10 +85,21 @@ class FilesizeCLI:
     def __init__(self, args: Optional[List[str]] = None) -> None:
         """Initialize CLI with command-line arguments."""
         self.args = self._parse_args(args)
+        self._forced_unit: Optional[Tuple[int, str]] = (
+            UNIT_MAP[self.args.unit] if self.args.unit else None
+        )
+        # Results per (device, inode, recursive flag) and paths found missing;
+        # a single invocation is short-lived, so entries never need invalidating
+        self._size_cache: Dict[Tuple[int, int, bool], dict] = {}
+        self._missing_paths: Set[str] = set()
 
     @staticmethod
-    def _parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    def _parse_args(args: Optional[List[str]] = None) -> "argparse.Namespace":
         """Parse command-line arguments."""
+        # Imported lazily: argparse (and the gettext machinery it pulls in)
+        # is not needed when FilesizeCLI is used as a library
+        import argparse
+
         parser = argparse.ArgumentParser(
             description="Calculate file and directory sizes",
             formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -105,100 +152,177 @@ class FilesizeCLI:
         return parser.parse_args(args)
 
     def get_size(
-        self, input_paths: Optional[Union[str, List[str]]] = None
+        self, input_paths: Optional[Union[PathArg, Iterable[PathArg]]] = None
     ) -> Optional[str]:
         """
         Calculate and display sizes for provided paths.
 
         Args:
-            input_paths: Single path string or list of path strings.
-                If None, uses paths from command-line arguments.
+            input_paths: Single path or iterable of paths (str, bytes or
+                os.PathLike). If None, uses paths from command-line arguments.
 
         Returns:
             Formatted output string if input_paths provided,
             None otherwise.
         """
         paths = self._normalize_paths(input_paths)
+        # On the command line, stream each line through the text layer; it
+        # already buffers pipe writes. Only API callers get everything joined
+        stream = input_paths is None
+        write = sys.stdout.write
         results = []
 
         for path_str in paths:
             try:
-                result = self._process_path(Path(path_str))
-                results.append(result)
+                result = self._process_path(path_str)
             except (FileNotFoundError, PermissionError, OSError) as e:
-                results.append(f"{path_str}: Error - {e}")
+                result = f"{path_str}: Error - {e}"
 
-        output = "\n".join(results)
+            if stream:
+                write(result + "\n")
+            else:
+                results.append(result)
 
-        if input_paths is not None:
-            return output
+        if stream:
+            return None
 
-        print(output)
-        return None
+        return "\n".join(results)
 
     def _normalize_paths(
-        self, input_paths: Optional[Union[str, List[str]]]
+        self, input_paths: Optional[Union[PathArg, Iterable[PathArg]]]
     ) -> List[str]:
         """Normalize input paths to a list of strings."""
         if input_paths is None:
             return cast(List[str], self.args.paths)
 
-        if isinstance(input_paths, str):
-            return [input_paths]
+        if isinstance(input_paths, (str, bytes, os.PathLike)):
+            return [os.fsdecode(input_paths)]
 
-        if isinstance(input_paths, list):
-            return input_paths
+        try:
+            return [os.fsdecode(path) for path in input_paths]
+        except TypeError:
+            raise TypeError(
+                "input_paths must be a path or an iterable of paths"
+            ) from None
 
-        raise TypeError("input_paths must be str or list")
+    def _process_path(self, path_str: str) -> str:
+        """
+        Process a single path and return formatted output.
 
-    def _process_path(self, path: Path) -> str:
-        """Process a single path and return formatted output."""
-        if not path.exists():
-            raise FileNotFoundError(f"Path does not exist: {path}")
+        A regular file is formatted straight from its stat() result; only
+        directories go through the size cache and a scan.
+        """
+        st = self._stat(path_str)
 
-        stats = self._compute_size(path)
-        formatted_size = self._format_size(stats["size"])
+        if stat.S_ISREG(st.st_mode):
+            size = st.st_size
+            files = 1
+        else:
+            stats = self._compute_size(path_str, st)
+            size = stats["size"]
+            files = stats["files"]
 
         if self.args.clean:
-            return f"{int(stats['size'])}"
+            return str(size)
+
+        # Display the path the way pathlib spells it ("./a//b/" as "a/b")
+        display = PurePath(path_str)
+        files_label = "file" if files == 1 else "files"
+        return f"{display}: {self._format_size(size)} ({files} {files_label})"
+
+    def _stat(self, path: Union[str, "os.PathLike[str]"]) -> os.stat_result:
+        """
+        Stat a path, reporting missing paths with a readable message.
+
+        Paths found missing are remembered, so repeating them costs no
+        further stat() calls.
+        """
+        key = os.fspath(path)
+
+        if key not in self._missing_paths:
+            try:
+                return os.stat(path)
+            except FileNotFoundError:
+                self._missing_paths.add(key)
 
-        files_label = "file" if stats["files"] == 1 else "files"
-        return f"{path}: {formatted_size} ({stats['files']} {files_label})"
+        raise FileNotFoundError(f"Path does not exist: {path}")
 
-    def _compute_size(self, path: Path) -> dict:
+    def _compute_size(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        st: Optional[os.stat_result] = None,
+    ) -> dict:
         """
         Compute total size and file count for a path.
 
+        Results are cached, so paths given more than once are only
+        scanned once per invocation.
+
         Args:
-            path: Path to file or directory
+            path: File or directory path
+            st: Result of os.stat() on path, if the caller already has it
 
         Returns:
             Dictionary with 'files', 'size', and 'unit' keys
         """
-        if not path.exists():
-            raise FileNotFoundError(f"Path does not exist: {path}")
+        # One stat() both checks existence and tells files from directories
+        if st is None:
+            st = self._stat(path)
+
+        # Keyed on the inode rather than the path text, so different
+        # spellings of one directory share an entry and symlinks cannot alias
+        key = (st.st_dev, st.st_ino, bool(self.args.recursive))
+        stats = self._size_cache.get(key)
+        if stats is None:
+            stats = self._scan_path(path, st)
+            self._size_cache[key] = stats
+
+        return stats
+
+    def _scan_path(
+        self, path: Union[str, "os.PathLike[str]"], st: os.stat_result
+    ) -> dict:
+        """
+        Scan a file or directory without consulting the cache.
 
-        if path.is_file():
-            try:
-                stat = path.stat()
-                return {"files": 1, "size": stat.st_size, "unit": "bytes"}
-            except OSError as e:
-                raise OSError(f"Cannot access file {path}: {e}")
+        Args:
+            path: File or directory path
+            st: Result of os.stat() on path
 
-        if path.is_dir():
+        Returns:
+            Dictionary with 'files', 'size', and 'unit' keys
+        """
+        if stat.S_ISREG(st.st_mode):
+            return {"files": 1, "size": st.st_size, "unit": "bytes"}
+
+        if stat.S_ISDIR(st.st_mode):
             total_size = 0
             file_count = 0
 
-            try:
-                iterator = path.rglob("*") if self.args.recursive else path.iterdir()
+            subdirs: Optional[List[str]] = [] if self.args.recursive else None
 
-                for item in iterator:
-                    if item.is_file():
-                        try:
-                            total_size += item.stat().st_size
-                            file_count += 1
-                        except OSError:
-                            continue
+            try:
+                # _scandir_files has already probed entry.is_file(), so
+                # entry.stat() reuses the DirEntry cache. Never convert
+                # the entry back into a Path: that throws the cache away
+                # and costs an extra stat() per file.
+                for entry in self._scandir_files(path, subdirs):
+                    try:
+                        total_size += entry.stat(follow_symlinks=False).st_size
+                        file_count += 1
+                    except _SKIPPED_FILE_ERRORS:
+                        continue
+
+                if subdirs:
+                    results: Iterable[Tuple[int, int]]
+                    if len(subdirs) > PARALLEL_MIN_DIRS:
+                        results = self._compute_size_parallel(subdirs)
+                    else:
+                        results = map(self._walk_size, subdirs)
+
+                    for files, size in results:
+                        file_count += files
+                        total_size += size
 
                 return {"files": file_count, "size": total_size, "unit": "bytes"}
             except OSError as e:
@@ -206,6 +330,136 @@ class FilesizeCLI:
 
         raise ValueError(f"Path is neither file nor directory: {path}")
 
+    @staticmethod
+    def _scandir_files(
+        path: Union[str, "os.PathLike[str]"],
+        subdirs: Optional[List[str]] = None,
+    ) -> Iterator["os.DirEntry[str]"]:
+        """
+        Yield the regular files directly inside a directory.
+
+        Symlinks are skipped. Subdirectories are collected into subdirs
+        when a list is given, otherwise they are skipped as well.
+
+        Args:
+            path: Directory to scan
+            subdirs: Optional list receiving the paths of subdirectories
+
+        Yields:
+            DirEntry objects for regular files
+        """
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    yield entry
+                elif subdirs is not None and entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+
+    def _walk_size(
+        self, top: str, cancel: Optional["threading.Event"] = None
+    ) -> Tuple[int, int]:
+        """
+        Count and sum the regular files in a directory tree.
+
+        Unreadable directories and files below top are skipped, and
+        symlinks are never followed or counted. Entries are consumed from
+        the walk in a single pass and never collected (or sorted), so
+        memory use stays flat however large the tree is.
+
+        The walk stops early, returning partial totals, once cancel is set.
+
+        Where supported, os.fwalk is used and each file is stat'ed through
+        its directory's descriptor, so the kernel does not have to look up
+        every parent directory again for each file in a deep tree.
+
+        Args:
+            top: Directory to walk
+            cancel: Optional event that interrupts the walk when set
+
+        Returns:
+            Tuple of (file count, total size in bytes)
+        """
+        total_size = 0
+        file_count = 0
+        # Bound to locals once: this loop runs for every file in the tree
+        is_regular = stat.S_ISREG
+        skipped = _SKIPPED_FILE_ERRORS
+
+        if _HAS_FWALK:
+            stat_at = os.stat
+            try:
+                for _root, _dirs, files, dir_fd in os.fwalk(top):
+                    if cancel is not None and cancel.is_set():
+                        break
+                    for name in files:
+                        try:
+                            st = stat_at(name, dir_fd=dir_fd, follow_symlinks=False)
+                        except skipped:
+                            continue
+                        if is_regular(st.st_mode):
+                            total_size += st.st_size
+                            file_count += 1
+            except skipped:
+                # Unlike os.walk, fwalk raises when top itself cannot be
+                # opened; errors further down go to its ignored onerror
+                return 0, 0
+        else:
+            lstat = os.lstat
+            join = os.path.join
+            for root, _dirs, files in os.walk(top):
+                if cancel is not None and cancel.is_set():
+                    break
+                for name in files:
+                    try:
+                        st = lstat(join(root, name))
+                    except skipped:
+                        continue
+                    if is_regular(st.st_mode):
+                        total_size += st.st_size
+                        file_count += 1
+
+        return file_count, total_size
+
+    def _compute_size_parallel(self, subdirs: List[str]) -> List[Tuple[int, int]]:
+        """
+        Walk several directory trees concurrently.
+
+        Scanning is bound by syscall latency rather than CPU, so threads
+        overlap well on SSDs and network filesystems despite the GIL.
+
+        Work is only split at the top level, one subtree per task: a tree
+        whose size sits under a single top-level directory is still walked
+        by one thread.
+
+        Args:
+            subdirs: Directories to walk, one task each
+
+        Returns:
+            List of (file count, total size) tuples, one per directory
+        """
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        cancel = threading.Event()
+        workers = min(MAX_WORKERS, len(subdirs))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            results = list(
+                executor.map(lambda top: self._walk_size(top, cancel), subdirs)
+            )
+        except KeyboardInterrupt:
+            # Ctrl-C must not wait for every queued subtree: drop pending
+            # tasks and tell running walks to stop at their next directory
+            cancel.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
+
+        executor.shutdown()
+        return results
+
     def _format_size(self, size: int) -> str:
         """
         Format size in bytes to human-readable string.
@@ -219,20 +473,26 @@ class FilesizeCLI:
         if not isinstance(size, (int, float)) or size < 0:
             raise ValueError("Size must be a non-negative number")
 
-        if self.args.unit:
-            factor, suffix = UNIT_MAP[self.args.unit]
-            value = size / factor
-            return f"{value:.2f} {suffix}" if factor != 1 else f"{int(value)} {suffix}"
+        size = int(size)
 
-        for unit_key in ("tb", "gb", "mb", "kb", "b"):
-            factor, suffix = UNIT_MAP[unit_key]
-            if size >= factor:
-                value = size / factor
-                return (
-                    f"{value:.2f} {suffix}" if factor != 1 else f"{int(value)} {suffix}"
-                )
+        if self._forced_unit is not None:
+            factor, suffix = self._forced_unit
+            if factor == 1:
+                return f"{size} {suffix}"
+        elif size < KB:
+            return f"{size} B"
+        else:
+            # Factors are powers of 1024, so every 10 bits of size is one unit
+            factor, suffix = _UNITS_ASC[
+                min(_MAX_UNIT_INDEX, (size.bit_length() - 1) // 10)
+            ]
 
-        return f"{int(size)} B"
+        # Integer arithmetic, rounding half to even like float formatting
+        hundredths, remainder = divmod(size * 100, factor)
+        if remainder * 2 > factor or (remainder * 2 == factor and hundredths & 1):
+            hundredths += 1
+        whole, fraction = divmod(hundredths, 100)
+        return f"{whole}.{fraction:02d} {suffix}"
 
 
 def main() -> int:
@@ -240,7 +500,14 @@ def main() -> int:
     try:
         cli = FilesizeCLI()
         cli.get_size()
+        sys.stdout.flush()
         return 0
+    except BrokenPipeError:
+        # The reader went away (e.g. "filesize * | head"); point stdout at
+        # devnull so the flush at interpreter exit does not fail again
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
     except KeyboardInterrupt:
         print("\nOperation cancelled by user", file=sys.stderr)
         return 130
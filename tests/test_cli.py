@@ -14,8 +14,12 @@
 
 """Tests for filesize-cli."""
 
+import io
 import os
+import subprocess
+import sys
 import tempfile
+import tracemalloc
 from pathlib import Path
 from unittest.mock import patch
 
@@ -120,10 +124,22 @@ class TestFilesizeCLI:
         paths = ["file1.txt", "file2.txt"]
         assert cli._normalize_paths(paths) == paths
 
+    def test_normalize_paths_path_like(self, cli):
+        """Test path normalization with path-like and bytes paths."""
+        assert cli._normalize_paths(Path("test.txt")) == ["test.txt"]
+        assert cli._normalize_paths(b"test.txt") == ["test.txt"]
+
+    def test_normalize_paths_iterable(self, cli):
+        """Test path normalization with tuples and generators."""
+        assert cli._normalize_paths(("a.txt", Path("b.txt"))) == ["a.txt", "b.txt"]
+        assert cli._normalize_paths(p for p in ["a.txt"]) == ["a.txt"]
+
     def test_normalize_paths_invalid(self, cli):
         """Test path normalization with invalid type."""
         with pytest.raises(TypeError):
             cli._normalize_paths(123)
+        with pytest.raises(TypeError):
+            cli._normalize_paths(["file.txt", 123])
 
     def test_compute_size_file(self, cli, temp_file):
         """Test computing size for a file."""
@@ -145,11 +161,208 @@ class TestFilesizeCLI:
         assert stats["files"] == 3  # All files including subdirectory
         assert stats["size"] == 600  # 100 + 200 + 300 bytes
 
+    def test_compute_size_directory_parallel(self, cli, temp_dir):
+        """Test that wide recursive scans are spread across threads."""
+        for i in range(5):
+            branch = temp_dir / f"branch{i}" / "nested"
+            branch.mkdir(parents=True)
+            (branch / "data.txt").write_text("d" * 10)
+
+        cli.args.recursive = True
+        with patch.object(
+            FilesizeCLI, "_compute_size_parallel", wraps=cli._compute_size_parallel
+        ) as mock_parallel:
+            stats = cli._compute_size(temp_dir)
+
+        mock_parallel.assert_called_once()
+        assert stats["files"] == 8
+        assert stats["size"] == 650
+
+    def test_compute_size_parallel_interrupted(self, cli, temp_dir):
+        """Test that an interrupt cancels pending subtrees without waiting."""
+        with patch("concurrent.futures.ThreadPoolExecutor") as mock_executor:
+            executor = mock_executor.return_value
+            executor.map.side_effect = KeyboardInterrupt
+            with pytest.raises(KeyboardInterrupt):
+                cli._compute_size_parallel([str(temp_dir)] * 5)
+
+        executor.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+        assert cli._walk_size(str(temp_dir)) == (3, 600)
+
+    def test_compute_size_parallel_error_keeps_instance_usable(self, cli, temp_dir):
+        """Test that a failed parallel scan does not truncate later scans."""
+        real_walk_size = cli._walk_size
+
+        def failing_walk_size(top, cancel=None):
+            if top == "broken":
+                raise OSError(5, "Input/output error")
+            return real_walk_size(top, cancel)
+
+        with patch.object(cli, "_walk_size", side_effect=failing_walk_size):
+            with pytest.raises(OSError):
+                cli._compute_size_parallel(["broken"] * 5)
+
+        assert cli._compute_size_parallel([str(temp_dir)] * 5) == [(3, 600)] * 5
+
+    def test_compute_size_directory_sequential(self, cli, temp_dir):
+        """Test that narrow recursive scans stay on the calling thread."""
+        cli.args.recursive = True
+        with patch.object(FilesizeCLI, "_compute_size_parallel") as mock_parallel:
+            stats = cli._compute_size(temp_dir)
+
+        mock_parallel.assert_not_called()
+        assert stats["files"] == 3
+
+    @pytest.mark.parametrize("has_fwalk", [True, False])
+    def test_walk_size(self, cli, temp_dir, has_fwalk):
+        """Test walking a tree with and without directory descriptors."""
+        if has_fwalk and not hasattr(os, "fwalk"):
+            pytest.skip("os.fwalk not supported on this platform")
+
+        with patch("filesize_cli.cli._HAS_FWALK", has_fwalk):
+            assert cli._walk_size(str(temp_dir)) == (3, 600)
+
+    @pytest.mark.parametrize("has_fwalk", [True, False])
+    def test_compute_size_unreadable_subdirectory(self, cli, temp_dir, has_fwalk):
+        """Test that an unreadable subdirectory is skipped under -r."""
+        if has_fwalk and not hasattr(os, "fwalk"):
+            pytest.skip("os.fwalk not supported on this platform")
+
+        locked = str(temp_dir / "locked")
+        os.mkdir(locked)
+        real_open = os.open
+        real_scandir = os.scandir
+
+        def deny_open(path, *args, **kwargs):
+            if os.fspath(path) == locked:
+                raise PermissionError(13, "Permission denied", locked)
+            return real_open(path, *args, **kwargs)
+
+        def deny_scandir(path="."):
+            if not isinstance(path, int) and os.fspath(path) == locked:
+                raise PermissionError(13, "Permission denied", locked)
+            return real_scandir(path)
+
+        cli.args.recursive = True
+        with patch("filesize_cli.cli._HAS_FWALK", has_fwalk):
+            with patch("os.open", new=deny_open):
+                with patch("os.scandir", new=deny_scandir):
+                    stats = cli._compute_size(temp_dir)
+
+        assert stats["files"] == 3
+        assert stats["size"] == 600
+
+    def test_walk_size_skips_vanished_files(self, cli, temp_dir):
+        """Test that files disappearing mid-walk are skipped."""
+        error = FileNotFoundError(2, "No such file or directory")
+        with patch("filesize_cli.cli._HAS_FWALK", False):
+            with patch("os.lstat", side_effect=error):
+                assert cli._walk_size(str(temp_dir)) == (0, 0)
+
+    def test_walk_size_propagates_other_errors(self, cli, temp_dir):
+        """Test that unexpected errors abort the walk."""
+        with patch("filesize_cli.cli._HAS_FWALK", False):
+            with patch("os.lstat", side_effect=OSError(5, "Input/output error")):
+                with pytest.raises(OSError):
+                    cli._walk_size(str(temp_dir))
+
+    @pytest.mark.slow
+    def test_walk_size_streams_entries(self, cli):
+        """Test that walking a huge tree does not materialize its entries."""
+        count = 100_000
+        file_stat = os.stat_result((0o100644, 0, 0, 1, 0, 0, 10, 0, 0, 0))
+
+        def fake_walk(top):
+            for i in range(count):
+                yield f"{top}/dir{i}", [], [f"file{i}.txt"]
+
+        with patch("filesize_cli.cli._HAS_FWALK", False):
+            with patch("os.walk", new=fake_walk):
+                with patch("os.lstat", new=lambda path: file_stat):
+                    tracemalloc.start()
+                    try:
+                        result = cli._walk_size("/fake")
+                        _, peak = tracemalloc.get_traced_memory()
+                    finally:
+                        tracemalloc.stop()
+
+        assert result == (count, count * 10)
+        # A materialized list of 100k entries would need several megabytes
+        assert peak < 1024**2
+
+    def test_compute_size_directory_uses_dir_entry_stat(self, cli, temp_dir):
+        """Test that a flat scan never stats files by path."""
+        with patch("os.stat", wraps=os.stat) as mock_stat:
+            stats = cli._compute_size(temp_dir)
+        assert stats["files"] == 2
+        assert stats["size"] == 300
+        for call in mock_stat.call_args_list:
+            assert os.fspath(call.args[0]) == str(temp_dir)
+
+    def test_compute_size_directory_skips_symlinks(self, cli, temp_dir):
+        """Test that symlinks inside a directory are not counted."""
+        try:
+            (temp_dir / "link.txt").symlink_to(temp_dir / "file1.txt")
+            (temp_dir / "linkdir").symlink_to(temp_dir / "subdir")
+        except (OSError, NotImplementedError):
+            pytest.skip("Symlinks not supported on this platform")
+
+        cli.args.recursive = True
+        stats = cli._compute_size(temp_dir)
+        assert stats["files"] == 3
+        assert stats["size"] == 600
+
+    def test_compute_size_directory_unreadable(self, cli, temp_dir):
+        """Test that an unreadable top-level directory raises OSError."""
+        cli.args.recursive = True
+        error = PermissionError(13, "Permission denied", str(temp_dir))
+        with patch("os.scandir", side_effect=error):
+            with pytest.raises(OSError, match="Cannot access directory"):
+                cli._compute_size(temp_dir)
+
     def test_compute_size_nonexistent(self, cli):
         """Test computing size for non-existent path."""
         with pytest.raises(FileNotFoundError):
             cli._compute_size(Path("/nonexistent/path"))
 
+    def test_compute_size_cached(self, cli, temp_dir):
+        """Test that repeated paths are only scanned once."""
+        with patch.object(FilesizeCLI, "_scan_path", wraps=cli._scan_path) as scan:
+            first = cli._compute_size(str(temp_dir))
+            second = cli._compute_size(str(temp_dir) + os.sep)
+            cli.args.recursive = True
+            recursive = cli._compute_size(temp_dir)
+
+        assert first == second
+        assert recursive["files"] == 3
+        assert scan.call_count == 2
+
+    def test_compute_size_cache_not_aliased_by_symlinks(self, cli, temp_dir):
+        """Test that '..' after a symlink is not mistaken for its parent."""
+        elsewhere = temp_dir / "subdir" / "inner"
+        elsewhere.mkdir()
+        try:
+            (temp_dir / "link").symlink_to(elsewhere)
+        except (OSError, NotImplementedError):
+            pytest.skip("Symlinks not supported on this platform")
+
+        through_link = cli._compute_size(os.path.join(temp_dir, "link", ".."))
+        parent = cli._compute_size(temp_dir)
+
+        assert through_link["size"] == 300  # temp_dir/subdir
+        assert parent["size"] == 300  # temp_dir's own top-level files
+        assert through_link["files"] == 1
+        assert parent["files"] == 2
+
+    def test_compute_size_missing_cached(self, cli):
+        """Test that missing paths are remembered."""
+        with patch("os.stat", wraps=os.stat) as mock_stat:
+            for _ in range(2):
+                with pytest.raises(FileNotFoundError):
+                    cli._compute_size(Path("/nonexistent/path"))
+
+        mock_stat.assert_called_once()
+
     def test_compute_size_not_file_or_dir(self, cli, temp_dir):
         """Test computing size for non-file, non-directory path."""
         # Create a symlink (if supported)
@@ -161,6 +374,22 @@ class TestFilesizeCLI:
         except (OSError, NotImplementedError):
             pytest.skip("Symlinks not supported on this platform")
 
+    def test_compute_size_special_file(self, cli, temp_dir):
+        """Test computing size for a path that is neither file nor directory."""
+        if not hasattr(os, "mkfifo"):
+            pytest.skip("FIFOs not supported on this platform")
+
+        fifo = temp_dir / "fifo"
+        os.mkfifo(fifo)
+        with pytest.raises(ValueError):
+            cli._compute_size(fifo)
+
+    def test_compute_size_single_stat(self, cli, temp_file):
+        """Test that a file is sized with a single stat call."""
+        with patch("os.stat", wraps=os.stat) as mock_stat:
+            cli._compute_size(temp_file)
+        mock_stat.assert_called_once()
+
     def test_format_size_bytes(self, cli):
         """Test formatting size in bytes."""
         assert cli._format_size(0) == "0 B"
@@ -184,12 +413,38 @@ class TestFilesizeCLI:
         """Test formatting size in terabytes."""
         assert cli._format_size(1024**4) == "1.00 TB"
 
-    def test_format_size_forced_unit(self, cli):
+    def test_format_size_unit_boundaries(self, cli):
+        """Test unit selection just below and above each boundary."""
+        assert cli._format_size(1023) == "1023 B"
+        assert cli._format_size(1024**2 - 1) == "1024.00 KB"
+        assert cli._format_size(1024**3 - 1) == "1024.00 MB"
+        assert cli._format_size(1024**5) == "1024.00 TB"
+
+    def test_format_size_forced_unit(self):
         """Test formatting with forced unit."""
-        cli.args.unit = "mb"
+        cli = FilesizeCLI(["-u", "mb", "/dev/null"])
         assert cli._format_size(1024**2) == "1.00 MB"
         assert cli._format_size(100) == "0.00 MB"
 
+    def test_format_size_no_unit_map_lookup(self):
+        """Test that formatting uses units resolved at construction."""
+        cli = FilesizeCLI(["-u", "mb", "/dev/null"])
+        with patch.dict("filesize_cli.cli.UNIT_MAP", clear=True):
+            assert cli._format_size(1024**2) == "1.00 MB"
+            cli._forced_unit = None
+            assert cli._format_size(1024**3) == "1.00 GB"
+
+    def test_format_size_forced_bytes(self):
+        """Test formatting with bytes forced."""
+        cli = FilesizeCLI(["-u", "b", "/dev/null"])
+        assert cli._format_size(1024**2) == "1048576 B"
+
+    def test_format_size_rounding(self, cli):
+        """Test that exact halves round to even like float formatting."""
+        assert cli._format_size(1152) == "1.12 KB"  # 1.125
+        assert cli._format_size(1408) == "1.38 KB"  # 1.375
+        assert cli._format_size(2047) == "2.00 KB"
+
     def test_format_size_invalid(self, cli):
         """Test formatting invalid size."""
         with pytest.raises(ValueError):
@@ -199,14 +454,14 @@ class TestFilesizeCLI:
 
     def test_process_path_file(self, cli, temp_file):
         """Test processing a file path."""
-        result = cli._process_path(temp_file)
+        result = cli._process_path(str(temp_file))
         assert str(temp_file) in result
         assert "13 B" in result
         assert "(1 file)" in result
 
     def test_process_path_directory(self, cli, temp_dir):
         """Test processing a directory path."""
-        result = cli._process_path(temp_dir)
+        result = cli._process_path(str(temp_dir))
         assert str(temp_dir) in result
         assert "300 B" in result
         assert "(2 files)" in result
@@ -214,13 +469,42 @@ class TestFilesizeCLI:
     def test_process_path_clean(self, cli, temp_file):
         """Test processing with clean output."""
         cli.args.clean = True
-        result = cli._process_path(temp_file)
+        result = cli._process_path(str(temp_file))
         assert result == "13"
 
+    def test_get_size_clean(self, temp_file, temp_dir):
+        """Test clean output for files and directories."""
+        cli = FilesizeCLI(["-c", "/dev/null"])
+        with patch.object(FilesizeCLI, "_format_size") as mock_format:
+            result = cli.get_size([str(temp_file), str(temp_dir), "/nonexistent"])
+
+        mock_format.assert_not_called()
+        lines = result.split("\n")
+        assert lines[:2] == ["13", "300"]
+        assert "Path does not exist" in lines[2]
+
+    def test_process_path_file_single_stat(self, cli, temp_file):
+        """Test that a file is processed without scanning or caching."""
+        with patch("os.stat", wraps=os.stat) as mock_stat:
+            with patch.object(FilesizeCLI, "_compute_size") as mock_compute:
+                result = cli._process_path(str(temp_file))
+
+        assert result == f"{temp_file}: 13 B (1 file)"
+        mock_stat.assert_called_once()
+        mock_compute.assert_not_called()
+
+    def test_process_path_normalizes_display(self, cli, temp_dir):
+        """Test that the displayed path is normalized like pathlib does."""
+        base = str(temp_dir)
+        result = cli._process_path(f"{base}//./subdir/")
+        assert result == f"{base}{os.sep}subdir: 300 B (1 file)"
+        result = cli._process_path(os.path.join(base, ".", "file1.txt"))
+        assert result == f"{os.path.join(base, 'file1.txt')}: 100 B (1 file)"
+
     def test_process_path_nonexistent(self, cli):
         """Test processing non-existent path."""
         with pytest.raises(FileNotFoundError):
-            cli._process_path(Path("/nonexistent"))
+            cli._process_path("/nonexistent")
 
     def test_get_size_returns_string(self, cli, temp_file):
         """Test get_size returns string when paths provided."""
@@ -228,12 +512,39 @@ class TestFilesizeCLI:
         assert isinstance(result, str)
         assert str(temp_file) in result
 
-    def test_get_size_prints(self, cli, temp_file):
+    def test_get_size_prints(self, cli, temp_file, capsys):
         """Test get_size prints when no paths provided."""
         cli.args.paths = [str(temp_file)]
-        with patch("builtins.print") as mock_print:
+        assert cli.get_size() is None
+        out = capsys.readouterr().out
+        assert out == f"{temp_file}: 13 B (1 file)\n"
+
+    def test_get_size_streams_output(self, cli, capsys):
+        """Test that command-line output is written path by path."""
+        cli.args.paths = ["first", "second"]
+        with patch.object(
+            FilesizeCLI, "_process_path", side_effect=["first: 1 B", KeyboardInterrupt]
+        ):
+            with pytest.raises(KeyboardInterrupt):
+                cli.get_size()
+
+        assert capsys.readouterr().out == "first: 1 B\n"
+
+    def test_get_size_text_stdout(self, cli, temp_file):
+        """Test printing to a replaced stdout without a binary buffer."""
+        cli.args.paths = [str(temp_file), str(temp_file)]
+        with patch("sys.stdout", new=io.StringIO()) as stdout:
             cli.get_size()
-            mock_print.assert_called_once()
+
+        assert stdout.getvalue() == f"{temp_file}: 13 B (1 file)\n" * 2
+
+    def test_get_size_missing_stat_once(self, cli):
+        """Test that a repeated missing path is only stat'ed once."""
+        with patch("os.stat", wraps=os.stat) as mock_stat:
+            result = cli.get_size(["/nonexistent", "/nonexistent"])
+
+        mock_stat.assert_called_once()
+        assert result.count("Path does not exist") == 2
 
     def test_get_size_multiple_paths(self, cli, temp_file, temp_dir):
         """Test get_size with multiple paths."""
@@ -268,6 +579,22 @@ class TestMainFunction:
                 result = main()
                 assert result == 130
 
+    def test_main_broken_pipe(self):
+        """Test that a closed output pipe ends the program quietly."""
+        paths = [__file__] * 5000
+        code = "import sys; from filesize_cli.cli import main; sys.exit(main())"
+        process = subprocess.Popen(
+            [sys.executable, "-c", code, *paths],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        process.stdout.readline()
+        process.stdout.close()
+        _, stderr = process.communicate()
+
+        assert process.returncode == 1
+        assert stderr == b""
+
     def test_main_unexpected_error(self):
         """Test main function with unexpected error."""
         with patch("sys.argv", ["filesize", __file__]):
@@ -281,6 +608,17 @@ class TestMainFunction:
 class TestIntegration:
     """Integration tests."""
 
+    def test_import_does_not_load_argparse(self):
+        """Test that importing the module defers heavy stdlib imports."""
+        code = (
+            "import sys, filesize_cli.cli; "
+            "print('argparse' in sys.modules, 'concurrent.futures' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "False False"
+
     def test_full_cli_workflow(self, temp_dir):
         """Test complete CLI workflow."""
         cli = FilesizeCLI([str(temp_dir), "-r"])